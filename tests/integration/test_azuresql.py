@@ -48,6 +48,12 @@ def test_create_table_replace(azure_sql):
     assert table_object_id is not None
 
 
+def test_table_exists_after_create(azure_sql):
+    # The cached catalog is refreshed after the CREATE TABLE statement.
+    assert azure_sql.exists(table=TABLE, schema=SCHEMA)
+    assert f"{SCHEMA}.{TABLE}" in azure_sql.tables
+
+
 def test_create_table_delete(azure_sql, TEST_CSV_FILE_BLOB_PATH):
     insert_executed = azure_sql.bulk_insert(
         schema=SCHEMA,
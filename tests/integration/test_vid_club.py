@@ -242,3 +242,38 @@ def test_drop_duplicates():
     df_check = df[dups_mask]
 
     assert len(df_check) == 0
+
+
+@pytest.mark.proper
+def test_iter_pages_async():
+    """
+    Checks if iter_pages_async method yields API responses, each of them carrying data.
+    """
+    _, first_url = vc.check_connection(
+        source="jobs",
+        from_date="2022-04-01",
+        to_date="2022-04-12",
+        items_per_page=1,
+    )
+    responses = list(
+        vc.iter_pages_async(
+            first_url=first_url, items_per_page=1, max_concurrent_requests=2
+        )
+    )
+
+    assert all("data" in response for response in responses)
+
+
+@pytest.mark.proper
+def test_iter_pages():
+    """
+    Checks if iter_pages method yields DataFrames carrying together the same data as get_response.
+    """
+    kwargs = dict(
+        source="jobs", from_date="2022-04-01", to_date="2022-04-12", items_per_page=10
+    )
+    pages = list(vc.iter_pages(**kwargs))
+    df = vc.get_response(**kwargs)
+
+    assert all(isinstance(page, pd.DataFrame) for page in pages)
+    assert sum(len(page) for page in pages) == len(df)
@@ -0,0 +1,42 @@
+from unittest import mock
+
+import pandas as pd
+
+from viadot.tasks import VidClubToDF
+
+CREDENTIALS = {"token": "test_token", "url": "https://api/test/"}
+
+
+@mock.patch(
+    "viadot.sources.vid_club.VidClub.iter_total_load",
+    return_value=iter(
+        [
+            pd.DataFrame(
+                {"id": [1, 2], "regionID": [1, 1], "submissionDate": ["a", "b"]}
+            ),
+            pd.DataFrame({"id": [3], "submissionDate": ["c"]}),
+        ]
+    ),
+)
+def test_vid_club_to_df_stream_cols_to_drop(mock_iter_total_load):
+    """
+    Checks if with stream=True the run method returns the pages lazily, with columns from cols_to_drop dropped
+    from each page and columns missing in a page ignored.
+    """
+    vc_to_df = VidClubToDF(credentials=CREDENTIALS)
+
+    pages = vc_to_df.run(
+        source="jobs",
+        from_date="2022-03-23",
+        to_date="2022-03-24",
+        credentials=CREDENTIALS,
+        cols_to_drop=["regionID", "submissionDate"],
+        stream=True,
+    )
+    assert not isinstance(pages, pd.DataFrame)
+
+    pages = list(pages)
+
+    assert len(pages) == 2
+    assert all(list(page.columns) == ["id"] for page in pages)
+    mock_iter_total_load.assert_called_once()
@@ -0,0 +1,103 @@
+import json
+from unittest import mock
+
+import pandas as pd
+
+from viadot.sources import VidClub
+
+CREDENTIALS = {"token": "test_token", "url": "https://api/test/"}
+
+
+def test_optimize_dtypes():
+    """
+    Checks if optimize_dtypes converts date columns to datetime and repeated text columns to category,
+    leaving unique text columns as they are.
+    """
+    df = pd.DataFrame(
+        {
+            "submissionDate": ["2023-03-24", "2023-03-25", "2023-03-25", None, None],
+            "region": ["pl", "pl", "hu", "pl", "pl"],
+            "name": ["a", "b", "c", "d", "e"],
+        }
+    )
+
+    df = VidClub.optimize_dtypes(df)
+
+    assert pd.api.types.is_datetime64_any_dtype(df["submissionDate"])
+    assert pd.api.types.is_categorical_dtype(df["region"])
+    assert df["name"].dtype == object
+
+
+@mock.patch("viadot.sources.vid_club.VidClub.check_connection")
+def test_product_ids_in_get_response_and_iter_pages(mock_check_connection):
+    """
+    Checks if records returned keyed by id get the same `_id` column and RangeIndex from get_response and iter_pages.
+    """
+    mock_check_connection.return_value = (
+        {"data": {"10": {"name": "a"}, "11": {"name": "b"}}},
+        "https://api/test/product?from=2023-03-24",
+    )
+    vc = VidClub(credentials=CREDENTIALS)
+    kwargs = dict(source="product", from_date="2023-03-24", to_date="2023-03-24")
+
+    df = vc.get_response(**kwargs)
+    df_pages = pd.concat(list(vc.iter_pages(**kwargs)), ignore_index=True)
+
+    assert list(df["_id"]) == ["10", "11"]
+    assert isinstance(df.index, pd.RangeIndex)
+    pd.testing.assert_frame_equal(df, df_pages)
+
+
+def _page_response(next_cursor):
+    return mock.Mock(
+        content=json.dumps({"data": [{"a": 1}, {"a": 2}], "next": next_cursor}).encode()
+    )
+
+
+@mock.patch("viadot.sources.vid_club.handle_api_response")
+@mock.patch("viadot.sources.vid_club.VidClub.check_connection")
+def test_pagination_stops_on_repeated_cursor(
+    mock_check_connection, mock_handle_api_response, caplog
+):
+    """
+    Checks if cursor pagination stops when the API returns an already retrieved cursor again.
+    """
+    mock_check_connection.return_value = (
+        {"data": [{"a": 1}, {"a": 2}], "next": "cursor"},
+        "https://api/test/jobs?from=2023-03-24",
+    )
+    mock_handle_api_response.return_value = _page_response("cursor")
+    vc = VidClub(credentials=CREDENTIALS)
+
+    df = vc.get_response(
+        source="jobs", from_date="2023-03-24", to_date="2023-03-24", items_per_page=2
+    )
+
+    assert len(df) == 4
+    assert mock_handle_api_response.call_count == 1
+    assert "for the second time" in caplog.text
+
+
+@mock.patch("viadot.sources.vid_club.MAX_PAGES", 3)
+@mock.patch("viadot.sources.vid_club.handle_api_response")
+@mock.patch("viadot.sources.vid_club.VidClub.check_connection")
+def test_pagination_stops_at_max_pages(
+    mock_check_connection, mock_handle_api_response, caplog
+):
+    """
+    Checks if cursor pagination stops after MAX_PAGES pages and logs a warning.
+    """
+    mock_check_connection.return_value = (
+        {"data": [{"a": 1}, {"a": 2}], "next": 1},
+        "https://api/test/jobs?from=2023-03-24",
+    )
+    mock_handle_api_response.side_effect = [_page_response(i) for i in range(2, 10)]
+    vc = VidClub(credentials=CREDENTIALS)
+
+    df = vc.get_response(
+        source="jobs", from_date="2023-03-24", to_date="2023-03-24", items_per_page=2
+    )
+
+    assert len(df) == 6
+    assert mock_handle_api_response.call_count == 2
+    assert "Reached the limit of 3 pages" in caplog.text
@@ -258,9 +258,12 @@ class SQL(Source):
             self._con.timeout = self.query_timeout
         return self._con
 
-    def run(self, query: str) -> Union[List[Record], bool]:
+    def run(self, query: str, params: Tuple[Any] = None) -> Union[List[Record], bool]:
         cursor = self.con.cursor()
-        cursor.execute(query)
+        if params:
+            cursor.execute(query, params)
+        else:
+            cursor.execute(query)
 
         query_sanitized = query.strip().upper()
         if query_sanitized.startswith("SELECT") or query_sanitized.startswith("WITH"):
@@ -1,8 +1,9 @@
 import struct
+import time
 from datetime import datetime, timedelta, timezone
-from typing import List
+from typing import Any, Dict, List, Set, Tuple, Union
 
-from .base import SQL
+from .base import SQL, Record
 
 
 class SQLServer(SQL):
@@ -12,25 +13,86 @@ class SQLServer(SQL):
         self,
         config_key="SQL_SERVER",
         driver="ODBC Driver 17 for SQL Server",
+        catalog_ttl: int = 60,
         *args,
         **kwargs,
     ):
+        """A SQL Server source class.
+
+        Args:
+            config_key (str, optional): The key inside local config containing the config.
+                Defaults to "SQL_SERVER".
+            driver (str, optional): The SQL driver to use. Defaults to "ODBC Driver 17 for SQL Server".
+            catalog_ttl (int, optional): For how many seconds the list of schemas and tables used by
+                `schemas`, `tables` and `exists()` is kept before it is read again. Defaults to 60.
+        """
         super().__init__(*args, driver=driver, config_key=config_key, **kwargs)
         self.con.add_output_converter(-155, self._handle_datetimeoffset)
+        self.catalog_ttl = catalog_ttl
+        self._catalog: Dict[str, Set[str]] = None
+        self._catalog_index: Set[Tuple[str, str]] = set()
+        self._catalog_loaded_at = 0.0
+
+    def _load_catalog(self):
+        """Read all schemas together with their tables in a single query."""
+        rows = self.run("""
+            SELECT s.name, t.name
+            FROM sys.schemas s
+            LEFT JOIN sys.tables t
+                ON t.schema_id = s.schema_id
+            ORDER BY s.name, t.name
+            """)
+        catalog = {}
+        for schema, table in rows:
+            tables = catalog.setdefault(schema, set())
+            if table is not None:
+                tables.add(table)
+        self._catalog = catalog
+        # Names are compared case-insensitively, like with SQL Server's default collation.
+        self._catalog_index = {
+            (schema.lower(), table.lower())
+            for schema, tables in catalog.items()
+            for table in tables
+        }
+        self._catalog_loaded_at = time.monotonic()
+
+    def _load_catalog_if_outdated(self):
+        """Read the schemas and tables again if they were never read, or are older than `catalog_ttl` seconds."""
+        if (
+            self._catalog is None
+            or time.monotonic() - self._catalog_loaded_at >= self.catalog_ttl
+        ):
+            self._load_catalog()
+
+    def refresh_catalog(self):
+        """Drop the cached schemas and tables, so that they are read again on next use.
+
+        This is done automatically after each statement executed with `run()` that is not a query.
+        """
+        self._catalog = None
 
     @property
     def schemas(self) -> List[str]:
         """Returns list of schemas"""
-        schemas_tuples = self.run("SELECT s.name as schema_name from sys.schemas s")
-        return [schema_tuple[0] for schema_tuple in schemas_tuples]
+        self._load_catalog_if_outdated()
+        return list(self._catalog)
 
     @property
     def tables(self) -> List[str]:
         """Returns list of tables"""
-        tables_tuples = self.run(
-            "SELECT schema_name(t.schema_id), t.name FROM sys.tables t"
-        )
-        return [".".join(row) for row in tables_tuples]
+        self._load_catalog_if_outdated()
+        return [
+            f"{schema}.{table}"
+            for schema, tables in self._catalog.items()
+            for table in sorted(tables)
+        ]
+
+    def run(self, query: str, params: Tuple[Any] = None) -> Union[List[Record], bool]:
+        result = super().run(query, params=params)
+        if result is True:
+            # The statement may have created or dropped schemas or tables.
+            self.refresh_catalog()
+        return result
 
     @staticmethod
     def _handle_datetimeoffset(dto_value):
@@ -65,6 +127,8 @@ class SQLServer(SQL):
 
     def exists(self, table: str, schema: str = None) -> bool:
         """Check whether a table exists.
+        The check uses the cached list of schemas and tables, see `refresh_catalog()`. A table
+        missing from that list is looked up in the database, so a miss is never cached.
         Args:
             table (str): The table to be checked.
             schema (str, optional): The schema whethe the table is located. Defaults to 'dbo'.
@@ -75,12 +139,21 @@ class SQLServer(SQL):
         if not schema:
             schema = self.DEFAULT_SCHEMA
 
-        list_table_info_query = f"""
-            SELECT *
+        self._load_catalog_if_outdated()
+        if (schema.lower(), table.lower()) in self._catalog_index:
+            return True
+
+        # The table may have been created since the catalog was loaded, e.g. by another connection.
+        exists_query = """
+            SELECT s.name, t.name
             FROM sys.tables t
             JOIN sys.schemas s
-                ON t.schema_id = s.schema_id
-            WHERE s.name = '{schema}' AND t.name = '{table}'
+                ON s.schema_id = t.schema_id
+            WHERE t.object_id = OBJECT_ID(QUOTENAME(?) + '.' + QUOTENAME(?), 'U')
         """
-        exists = bool(self.run(list_table_info_query))
+        rows = self.run(exists_query, params=(schema, table))
+        for found_schema, found_table in rows:
+            self._catalog.setdefault(found_schema, set()).add(found_table)
+            self._catalog_index.add((found_schema.lower(), found_table.lower()))
+        exists = len(rows) > 0
         return exists
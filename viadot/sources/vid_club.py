@@ -1,18 +1,35 @@
+import asyncio
 import json
 import os
-import urllib
-from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Literal, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Literal, Tuple, Union
+from urllib.parse import urlencode
 
+import aiohttp
 import pandas as pd
+import requests
 from prefect.utilities import logging
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
 
-from ..exceptions import CredentialError, ValidationError
+from ..exceptions import APIError, CredentialError, ValidationError
 from ..utils import handle_api_response
 from .base import Source
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 logger = logging.get_logger()
 
+# The oldest date for which the API holds data.
+OLDEST_DATE = date(2022, 3, 22)
+# Safety cap on the number of pages retrieved for a single query.
+MAX_PAGES = 10_000
+
 
 class VidClub(Source):
     """
@@ -37,8 +54,27 @@ class VidClub(Source):
             "Content-Type": "application/json",
         }
 
+        # A single session keeps the connection to the API alive between pages and calls.
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=5,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
         super().__init__(*args, credentials=credentials, **kwargs)
 
+    def close(self):
+        """Close the HTTP session used to query the API."""
+        self._session.close()
+
     def build_query(
         self,
         from_date: str,
@@ -66,13 +102,19 @@ class VidClub(Source):
             ValidationError: If any source different than the ones in the list are used.
         """
         if source in ["jobs", "product", "company"]:
-            url = f"{api_url}{source}?from={from_date}&to={to_date}&region={region}&limit={items_per_page}"
+            params = {
+                "from": from_date,
+                "to": to_date,
+                "region": region,
+                "limit": items_per_page,
+            }
         elif source == "survey":
-            url = f"{api_url}{source}?language=en&type=question"
+            params = {"language": "en", "type": "question"}
         else:
             raise ValidationError(
                 "Pick one these sources: jobs, product, company, survey"
             )
+        url = f"{api_url}{source}?{urlencode(params)}"
         return url
 
     def intervals(
@@ -93,18 +135,13 @@ class VidClub(Source):
             ValidationError: If the final date of the query is before the start date.
         """
 
-        if to_date == None:
-            to_date = datetime.today().strftime("%Y-%m-%d")
-
-        end_date = datetime.strptime(to_date, "%Y-%m-%d").date()
-        start_date = datetime.strptime(from_date, "%Y-%m-%d").date()
+        if to_date is None:
+            to_date = date.today().isoformat()
 
-        from_date_obj = datetime.strptime(from_date, "%Y-%m-%d")
+        end_date = date.fromisoformat(to_date)
+        start_date = date.fromisoformat(from_date)
 
-        to_date_obj = datetime.strptime(to_date, "%Y-%m-%d")
-        delta = to_date_obj - from_date_obj
-
-        if delta.days < 0:
+        if end_date < start_date:
             raise ValidationError("to_date cannot be earlier than from_date.")
 
         interval = timedelta(days=days_interval)
@@ -114,8 +151,8 @@ class VidClub(Source):
         period_start = start_date
         while period_start < end_date:
             period_end = min(period_start + interval, end_date)
-            starts.append(period_start.strftime("%Y-%m-%d"))
-            ends.append(period_end.strftime("%Y-%m-%d"))
+            starts.append(period_start.isoformat())
+            ends.append(period_end.isoformat())
             period_start = period_end
         if len(starts) == 0 and len(ends) == 0:
             starts.append(from_date)
@@ -151,7 +188,7 @@ class VidClub(Source):
             ValidationError: If to_date is earlier than from_date.
         """
 
-        if from_date < "2022-03-22":
+        if date.fromisoformat(from_date) < OLDEST_DATE:
             raise ValidationError("from_date cannot be earlier than 2022-03-22.")
 
         if to_date < from_date:
@@ -168,14 +205,280 @@ class VidClub(Source):
             items_per_page=items_per_page,
             region=region,
         )
-        headers = self.headers
         response = handle_api_response(
-            url=first_url, headers=headers, method="GET", verify=False
+            url=first_url, method="GET", verify=False, session=self._session
         )
-        response = response.json()
+        response = json_loads(response.content)
 
         return (response, first_url)
 
+    def iter_pages_async(
+        self,
+        first_url: str,
+        items_per_page: int = 100,
+        start_page: int = 2,
+        max_concurrent_requests: int = 16,
+        max_retries: int = 5,
+        timeout: tuple = (3.05, 60 * 30),
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Retrieve page-numbered results concurrently, starting from `start_page`.
+
+        Pages are requested in batches of `max_concurrent_requests` over a single aiohttp session
+        and yielded batch by batch. Fetching stops at the first page that holds fewer than `items_per_page`
+        entries, so a few requests past the last page may be issued and are discarded.
+
+        Args:
+            first_url (str): URL of the first page, as returned by check_connection.
+            items_per_page (int, optional): Number of entries per page. 100 entries by default.
+            start_page (int, optional): Number of the first page to retrieve. Defaults to 2.
+            max_concurrent_requests (int, optional): Maximum number of requests in flight at once. Defaults to 16.
+            max_retries (int, optional): How many times to retry a page that was throttled (429), failed with a
+                server error, timed out or could not connect, with exponential backoff. Defaults to 5.
+            timeout (tuple, optional): The connect and read timeouts of each request, in seconds. Defaults to (3.05, 60 * 30).
+
+        Yields:
+            Dict[str, Any]: Responses from the API, in page order.
+
+        Raises:
+            APIError: If a page could not be retrieved.
+        """
+        retry_statuses = [429, 500, 502, 503, 504]
+
+        async def open_session() -> aiohttp.ClientSession:
+            connect_timeout, read_timeout = timeout
+            return aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=connect_timeout, sock_read=read_timeout
+                ),
+            )
+
+        async def fetch(session: aiohttp.ClientSession, url: str) -> Dict[str, Any]:
+            for attempt in range(max_retries + 1):
+                try:
+                    async with session.get(url, ssl=False) as response:
+                        if response.status in retry_statuses and attempt < max_retries:
+                            await asyncio.sleep(0.5 * 2**attempt)
+                            continue
+                        if response.status != 200:
+                            raise APIError(
+                                f"The API call to {url} failed with status {response.status}."
+                            )
+                        return json_loads(await response.read())
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    if attempt < max_retries:
+                        await asyncio.sleep(0.5 * 2**attempt)
+                        continue
+                    if isinstance(e, asyncio.TimeoutError):
+                        raise APIError(f"The API call to {url} timed out.") from e
+                    raise APIError(
+                        f"The API call to {url} failed due to connection issues."
+                    ) from e
+
+        async def fetch_batch(
+            session: aiohttp.ClientSession, page: int
+        ) -> List[Dict[str, Any]]:
+            urls = [
+                f"{first_url}&page={page_number}"
+                for page_number in range(page, page + max_concurrent_requests)
+            ]
+            return await asyncio.gather(*[fetch(session, url) for url in urls])
+
+        # A dedicated event loop is kept between batches, so that the session and its
+        # connections are reused while the batches already retrieved are consumed.
+        loop = asyncio.new_event_loop()
+        try:
+            session = loop.run_until_complete(open_session())
+            try:
+                page = start_page
+                while True:
+                    batch = loop.run_until_complete(fetch_batch(session, page))
+                    for response in batch:
+                        yield response
+                        if len(response["data"]) != items_per_page:
+                            return
+                    page += max_concurrent_requests
+            finally:
+                loop.run_until_complete(session.close())
+        finally:
+            loop.close()
+
+    @staticmethod
+    def optimize_dtypes(
+        df: pd.DataFrame, max_unique_ratio: float = 0.5
+    ) -> pd.DataFrame:
+        """
+        Convert text columns to more compact types: columns holding only "%Y-%m-%d" dates to datetime,
+        and low-cardinality columns to category.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to convert. It is modified in place.
+            max_unique_ratio (float, optional): Highest ratio of unique values to rows for which a column is
+                converted to category. Defaults to 0.5.
+
+        Returns:
+            pd.DataFrame: The DataFrame with converted columns.
+        """
+        for col in df.select_dtypes(include="object").columns:
+            values = df[col]
+            try:
+                n_unique = values.nunique(dropna=False)
+            except TypeError:
+                # Columns holding nested objects (lists, dicts) are left untouched.
+                continue
+            dates = pd.to_datetime(
+                values, format="%Y-%m-%d", errors="coerce", cache=True
+            )
+            if values.notna().any() and dates.notna().sum() == values.notna().sum():
+                df[col] = dates
+            elif n_unique / max(len(df), 1) < max_unique_ratio:
+                df[col] = values.astype("category")
+        return df
+
+    def _iter_page_data(
+        self,
+        source: Literal["jobs", "product", "company", "survey"],
+        from_date: str,
+        to_date: str,
+        items_per_page: int,
+        region: Literal["bg", "hu", "hr", "pl", "ro", "si", "all"],
+        max_concurrent_requests: int,
+    ) -> Iterator[Union[List[Dict[str, Any]], Any]]:
+        """
+        Basing on the pagination type retrieved using check_connection function, yields the data carried by each page of the response.
+        For paginated endpoints it is a list of records. Pages carrying a dict of records keyed by id (e.g. of the product endpoint)
+        are turned into a list of records, with the key stored in the `_id` column.
+        """
+        response, first_url = self.check_connection(
+            source=source,
+            from_date=from_date,
+            to_date=to_date,
+            items_per_page=items_per_page,
+            region=region,
+        )
+
+        if source == "survey":
+            # The survey endpoint is not paginated.
+            if isinstance(response, dict) and "data" in response:
+                response = response["data"]
+            yield response
+            return
+
+        def page_records(
+            data: Union[List[Dict[str, Any]], Dict[str, Any]],
+        ) -> List[Dict[str, Any]]:
+            if isinstance(data, dict):
+                return [{**record, "_id": key} for key, record in data.items()]
+            return data
+
+        length = len(response["data"])
+        yield page_records(response["data"])
+
+        if "next" in response:
+
+            def get_next_page(response: Dict[str, Any]):
+                next_params = urlencode({"next": response["next"]})
+                url = f"{first_url}&{next_params}"
+                return handle_api_response(
+                    url=url, method="GET", verify=False, session=self._session
+                )
+
+            seen_cursors = set()
+
+            def has_next_page(response: Dict[str, Any]) -> bool:
+                next = response.get("next")
+                if len(response["data"]) != items_per_page or next is None:
+                    return False
+                if next in seen_cursors:
+                    logger.warning(
+                        f"The API returned the cursor '{next}' for the second time. Stopping pagination."
+                    )
+                    return False
+                if len(seen_cursors) + 1 >= MAX_PAGES:
+                    logger.warning(
+                        f"Reached the limit of {MAX_PAGES} pages. Stopping pagination."
+                    )
+                    return False
+                seen_cursors.add(next)
+                return True
+
+            # The next page is requested before the current one is yielded,
+            # so that the network round trip overlaps with processing the records.
+            executor = ThreadPoolExecutor(max_workers=1)
+            next_page = None
+            try:
+                if has_next_page(response):
+                    next_page = executor.submit(get_next_page, response)
+                while next_page is not None:
+                    response = json_loads(next_page.result().content)
+                    next_page = None
+                    if has_next_page(response):
+                        next_page = executor.submit(get_next_page, response)
+                    yield page_records(response["data"])
+            finally:
+                # If the consumer stops early, don't wait for the prefetched page.
+                if next_page is not None:
+                    next_page.cancel()
+                executor.shutdown(wait=False)
+        elif length == items_per_page:
+            pages = self.iter_pages_async(
+                first_url=first_url,
+                items_per_page=items_per_page,
+                max_concurrent_requests=max_concurrent_requests,
+            )
+            for page, response in enumerate(pages, start=2):
+                yield page_records(response["data"])
+                if page >= MAX_PAGES:
+                    logger.warning(
+                        f"Reached the limit of {MAX_PAGES} pages. Stopping pagination."
+                    )
+                    pages.close()
+                    break
+
+    def iter_pages(
+        self,
+        source: Literal["jobs", "product", "company", "survey"] = None,
+        from_date: str = "2022-03-22",
+        to_date: str = None,
+        items_per_page: int = 100,
+        region: Literal["bg", "hu", "hr", "pl", "ro", "si", "all"] = "all",
+        max_concurrent_requests: int = 16,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Gets the response from the API queried page by page, so that the whole response doesn't have to be held in memory.
+
+        Args:
+            source (Literal["jobs", "product", "company", "survey"], optional): The endpoint source to be accessed. Defaults to None.
+            from_date (str, optional): Start date for the query, by default is the oldest date in the data 2022-03-22.
+            to_date (str, optional): End date for the query. By default None, which will be executed as datetime.today().strftime("%Y-%m-%d") in code.
+            items_per_page (int, optional): Number of entries per page. 100 entries by default.
+            region (Literal["bg", "hu", "hr", "pl", "ro", "si", "all"], optional): Region filter for the query. Defaults to "all". [July 2023 status: parameter works only for 'all' on API]
+            max_concurrent_requests (int, optional): Maximum number of pages requested at once when the endpoint is paginated by page number. Defaults to 16.
+
+        Returns:
+            Iterator[pd.DataFrame]: Tables of the data carried by each page of the response.
+
+        Raises:
+            ValidationError: If any source different than the ones in the list are used.
+        """
+        if source not in ["jobs", "product", "company", "survey"]:
+            raise ValidationError(
+                "The source has to be: jobs, product, company or survey"
+            )
+        if to_date is None:
+            to_date = date.today().isoformat()
+
+        pages = self._iter_page_data(
+            source=source,
+            from_date=from_date,
+            to_date=to_date,
+            items_per_page=items_per_page,
+            region=region,
+            max_concurrent_requests=max_concurrent_requests,
+        )
+        return (pd.DataFrame(data) for data in pages)
+
     def get_response(
         self,
         source: Literal["jobs", "product", "company", "survey"] = None,
@@ -183,6 +486,8 @@ class VidClub(Source):
         to_date: str = None,
         items_per_page: int = 100,
         region: Literal["bg", "hu", "hr", "pl", "ro", "si", "all"] = "all",
+        max_concurrent_requests: int = 16,
+        optimize_dtypes: bool = False,
     ) -> pd.DataFrame:
         """
         Basing on the pagination type retrieved using check_connection function, gets the response from the API queried and transforms it into DataFrame.
@@ -193,6 +498,8 @@ class VidClub(Source):
             to_date (str, optional): End date for the query. By default None, which will be executed as datetime.today().strftime("%Y-%m-%d") in code.
             items_per_page (int, optional): Number of entries per page. 100 entries by default.
             region (Literal["bg", "hu", "hr", "pl", "ro", "si", "all"], optional): Region filter for the query. Defaults to "all". [July 2023 status: parameter works only for 'all' on API]
+            max_concurrent_requests (int, optional): Maximum number of pages requested at once when the endpoint is paginated by page number. Defaults to 16.
+            optimize_dtypes (bool, optional): Whether to convert date and low-cardinality text columns with optimize_dtypes. Defaults to False.
 
         Returns:
             pd.DataFrame: Table of the data carried in the response.
@@ -200,57 +507,29 @@ class VidClub(Source):
         Raises:
             ValidationError: If any source different than the ones in the list are used.
         """
-        headers = self.headers
         if source not in ["jobs", "product", "company", "survey"]:
             raise ValidationError(
                 "The source has to be: jobs, product, company or survey"
             )
-        if to_date == None:
-            to_date = datetime.today().strftime("%Y-%m-%d")
+        if to_date is None:
+            to_date = date.today().isoformat()
 
-        response, first_url = self.check_connection(
+        pages = self._iter_page_data(
             source=source,
             from_date=from_date,
             to_date=to_date,
             items_per_page=items_per_page,
             region=region,
+            max_concurrent_requests=max_concurrent_requests,
         )
-
-        if isinstance(response, dict):
-            keys_list = list(response.keys())
-        elif isinstance(response, list):
-            keys_list = list(response[0].keys())
+        if source == "survey":
+            df = pd.DataFrame(next(pages))
         else:
-            keys_list = []
+            # Records of all pages are collected first and turned into a DataFrame once.
+            df = pd.DataFrame.from_records(list(chain.from_iterable(pages)))
 
-        if "next" in keys_list:
-            ind = True
-        else:
-            ind = False
-
-        if "data" in keys_list:
-            df = pd.DataFrame(response["data"])
-            length = df.shape[0]
-            page = 1
-
-            while length == items_per_page:
-                if ind == True:
-                    next = response["next"]
-                    url = f"{first_url}&next={next}"
-                else:
-                    page += 1
-                    url = f"{first_url}&page={page}"
-                r = handle_api_response(
-                    url=url, headers=headers, method="GET", verify=False
-                )
-                response = r.json()
-                df_page = pd.DataFrame(response["data"])
-                if source == "product":
-                    df_page = df_page.transpose()
-                length = df_page.shape[0]
-                df = pd.concat((df, df_page), axis=0)
-        else:
-            df = pd.DataFrame(response)
+        if optimize_dtypes:
+            df = self.optimize_dtypes(df)
 
         return df
 
@@ -262,9 +541,12 @@ class VidClub(Source):
         items_per_page: int = 100,
         region: Literal["bg", "hu", "hr", "pl", "ro", "si", "all"] = "all",
         days_interval: int = 30,
+        max_workers: int = 8,
+        max_concurrent_requests: int = 16,
+        optimize_dtypes: bool = False,
     ) -> pd.DataFrame:
         """
-        Looping get_response and iterating by date ranges defined in intervals. Stores outputs as DataFrames in a list.
+        Running get_response for date ranges defined in intervals, several ranges at a time. Stores outputs as DataFrames in a list.
         At the end, daframes are concatenated in one and dropped duplicates that would appear when quering.
 
         Args:
@@ -274,6 +556,11 @@ class VidClub(Source):
             items_per_page (int, optional): Number of entries per page. 100 entries by default.
             region (Literal["bg", "hu", "hr", "pl", "ro", "si", "all"], optional): Region filter for the query. Defaults to "all". [July 2023 status: parameter works only for 'all' on API]
             days_interval (int, optional): Days specified in date range per api call (test showed that 30-40 is optimal for performance). Defaults to 30.
+            max_workers (int, optional): Maximum number of date ranges retrieved at the same time. Defaults to 8.
+            max_concurrent_requests (int, optional): Maximum number of page requests in flight at once, shared by all
+                date ranges retrieved at the same time. Each range gets max(1, max_concurrent_requests // max_workers). Defaults to 16.
+            optimize_dtypes (bool, optional): Whether to convert date and low-cardinality text columns of the final DataFrame
+                with optimize_dtypes. Defaults to False.
 
         Returns:
             pd.DataFrame: Dataframe of the concatanated data carried in the responses.
@@ -283,22 +570,25 @@ class VidClub(Source):
             from_date=from_date, to_date=to_date, days_interval=days_interval
         )
 
-        dfs_list = []
         if len(starts) > 0 and len(ends) > 0:
-            for start, end in zip(starts, ends):
+            # The request budget is split between the ranges retrieved at the same time.
+            requests_per_interval = max(1, max_concurrent_requests // max_workers)
+
+            def get_interval(interval: Tuple[str, str]) -> pd.DataFrame:
+                start, end = interval
                 logger.info(f"ingesting data for dates [{start}]-[{end}]...")
-                df = self.get_response(
+                return self.get_response(
                     source=source,
                     from_date=start,
                     to_date=end,
                     items_per_page=items_per_page,
                     region=region,
+                    max_concurrent_requests=requests_per_interval,
                 )
-                dfs_list.append(df)
-                if len(dfs_list) > 1:
-                    df = pd.concat(dfs_list, axis=0, ignore_index=True)
-                else:
-                    df = pd.DataFrame(dfs_list[0])
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                dfs_list = list(executor.map(get_interval, zip(starts, ends)))
+            df = pd.concat(dfs_list, axis=0, ignore_index=True, copy=False)
         else:
             df = self.get_response(
                 source=source,
@@ -306,10 +596,55 @@ class VidClub(Source):
                 to_date=to_date,
                 items_per_page=items_per_page,
                 region=region,
+                max_concurrent_requests=max_concurrent_requests,
             )
         df.drop_duplicates(inplace=True)
 
         if df.empty:
             logger.error("No data for this date range")
+        elif optimize_dtypes:
+            # Converted once on the final DataFrame, as categories of separate ranges would not match when concatenated.
+            df = self.optimize_dtypes(df)
 
         return df
+
+    def iter_total_load(
+        self,
+        source: Literal["jobs", "product", "company", "survey"] = None,
+        from_date: str = "2022-03-22",
+        to_date: str = None,
+        items_per_page: int = 100,
+        region: Literal["bg", "hu", "hr", "pl", "ro", "si", "all"] = "all",
+        days_interval: int = 30,
+        max_concurrent_requests: int = 16,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Streaming counterpart of total_load. Iterates by date ranges defined in intervals and yields the data page by page,
+        so that it can be written out without holding the whole result in memory.
+        Unlike total_load, duplicates that appear across date ranges are not dropped.
+
+        Args:
+            source (Literal["jobs", "product", "company", "survey"], optional): The endpoint source to be accessed. Defaults to None.
+            from_date (str, optional): Start date for the query, by default is the oldest date in the data 2022-03-22.
+            to_date (str, optional): End date for the query. By default None, which will be executed as datetime.today().strftime("%Y-%m-%d") in code.
+            items_per_page (int, optional): Number of entries per page. 100 entries by default.
+            region (Literal["bg", "hu", "hr", "pl", "ro", "si", "all"], optional): Region filter for the query. Defaults to "all". [July 2023 status: parameter works only for 'all' on API]
+            days_interval (int, optional): Days specified in date range per api call (test showed that 30-40 is optimal for performance). Defaults to 30.
+            max_concurrent_requests (int, optional): Maximum number of pages requested at once when the endpoint is paginated by page number. Defaults to 16.
+
+        Yields:
+            pd.DataFrame: Tables of the data carried by each page of the responses.
+        """
+        starts, ends = self.intervals(
+            from_date=from_date, to_date=to_date, days_interval=days_interval
+        )
+        for start, end in zip(starts, ends):
+            logger.info(f"ingesting data for dates [{start}]-[{end}]...")
+            yield from self.iter_pages(
+                source=source,
+                from_date=start,
+                to_date=end,
+                items_per_page=items_per_page,
+                region=region,
+                max_concurrent_requests=max_concurrent_requests,
+            )
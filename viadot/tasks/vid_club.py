@@ -1,8 +1,9 @@
 import copy
+import hashlib
 import json
 import os
 from datetime import timedelta
-from typing import Any, Dict, List, Literal
+from typing import Any, Dict, Iterator, List, Literal, Union
 
 import pandas as pd
 from prefect import Task
@@ -18,6 +19,10 @@ logger = logging.get_logger()
 
 
 class VidClubToDF(Task):
+    # VidClub clients shared by all runs, keyed by a hash of their credentials,
+    # so that their HTTP sessions (and open connections) are reused.
+    _client_cache: Dict[str, VidClub] = {}
+
     def __init__(
         self,
         source: Literal["jobs", "product", "company", "survey"] = None,
@@ -72,6 +77,25 @@ class VidClubToDF(Task):
         """Download Vid Club data to Pandas DataFrame"""
         return super().__call__(*args, **kwargs)
 
+    @classmethod
+    def get_client(cls, credentials: Dict[str, Any]) -> VidClub:
+        """
+        Get the VidClub client for the given credentials, creating it on first use.
+
+        Args:
+            credentials (Dict[str, Any]): Credentials to Vid Club APIs containing token.
+
+        Returns:
+            VidClub: The cached client.
+        """
+        key = hashlib.blake2b(
+            json.dumps(sorted(credentials.items()), default=str).encode(),
+            digest_size=16,
+        ).hexdigest()
+        if key not in cls._client_cache:
+            cls._client_cache[key] = VidClub(credentials=credentials)
+        return cls._client_cache[key]
+
     @defaults_from_attrs(
         "source",
         "credentials",
@@ -87,8 +111,11 @@ class VidClubToDF(Task):
         items_per_page: int = 100,
         region: str = "all",
         days_interval: int = 30,
+        max_workers: int = 8,
+        max_concurrent_requests: int = 16,
         cols_to_drop: List[str] = None,
-    ) -> pd.DataFrame:
+        stream: bool = False,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """
         Task run method.
 
@@ -100,17 +127,44 @@ class VidClubToDF(Task):
             items_per_page (int, optional): Number of entries per page. 100 entries by default.
             region (str, optional): Region filter for the query. Valid inputs: ["bg", "hu", "hr", "pl", "ro", "si", "all"]. Defaults to "all".
             days_interval (int, optional): Days specified in date range per api call (test showed that 30-40 is optimal for performance). Defaults to 30.
+            max_workers (int, optional): Maximum number of date ranges retrieved at the same time. Defaults to 8.
+            max_concurrent_requests (int, optional): Maximum number of page requests in flight at once, shared by all
+                date ranges retrieved at the same time. Defaults to 16.
             cols_to_drop (List[str], optional): List of columns to drop. Defaults to None.
+            stream (bool, optional): Whether to return an iterator of DataFrames, one per page of the responses, instead of
+                a single DataFrame. Pages are then retrieved one date range at a time, duplicates are not dropped and columns
+                from cols_to_drop missing in a page are ignored. The iterator is lazy: the API is only called while a downstream
+                task consumes it, so request errors and retries happen in that task, and the result cannot be pickled, which
+                rules out result checkpointing and executors that serialize task results (e.g. Dask). Defaults to False.
 
         Raises:
             KeyError: When DataFrame doesn't contain columns provided in the list of columns to drop.
             TypeError: When cols_to_drop is not a list type.
 
         Returns:
-            pd.DataFrame: The query result as a pandas DataFrame.
+            Union[pd.DataFrame, Iterator[pd.DataFrame]]: The query result as a pandas DataFrame, or as an iterator of
+                pandas DataFrames if stream is True.
         """
 
-        vc_obj = VidClub(credentials=credentials)
+        vc_obj = self.get_client(credentials=credentials)
+
+        if stream:
+            if cols_to_drop is not None and not isinstance(cols_to_drop, list):
+                raise TypeError("Provide columns to drop in a List.")
+            pages = vc_obj.iter_total_load(
+                source=source,
+                from_date=from_date,
+                to_date=to_date,
+                items_per_page=items_per_page,
+                region=region,
+                days_interval=days_interval,
+                max_concurrent_requests=max_concurrent_requests,
+            )
+            if cols_to_drop is not None:
+                pages = (
+                    page.drop(columns=cols_to_drop, errors="ignore") for page in pages
+                )
+            return pages
 
         vc_dataframe = vc_obj.total_load(
             source=source,
@@ -119,6 +173,8 @@ class VidClubToDF(Task):
             items_per_page=items_per_page,
             region=region,
             days_interval=days_interval,
+            max_workers=max_workers,
+            max_concurrent_requests=max_concurrent_requests,
         )
         if cols_to_drop is not None:
             if isinstance(cols_to_drop, list):
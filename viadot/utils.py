@@ -35,6 +35,7 @@ def handle_api_response(
     method: Literal["GET", "POST", "DELETE"] = "GET",
     body: str = None,
     verify: bool = True,
+    session: requests.Session = None,
 ) -> requests.models.Response:
     """Handle and raise Python exceptions during request with retry strategy for specific status.
     Args:
@@ -46,6 +47,8 @@ def handle_api_response(
         method (Literal ["GET", "POST","DELETE"], optional): REST API method to use. Defaults to "GET".
         body (str, optional): Data to send using POST method. Defaults to None.
         verify (bool, optional): Whether to verify cerificates. Defaults to True.
+        session (requests.Session, optional): An existing session to send the request with, so that its
+            connections are reused. Its own retry strategy is used. Defaults to None, which creates a new session.
     Raises:
         ValueError: Raises when 'method' parameter value hasn't been specified
         ReadTimeout: Stop waiting for a response after a given number of seconds with the timeout parameter.
@@ -61,15 +64,16 @@ def handle_api_response(
             f"Method not found. Please use one of the available methods: 'GET', 'POST', 'DELETE'."
         )
     try:
-        session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            status_forcelist=[429, 500, 502, 503, 504],
-            backoff_factor=1,
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        if session is None:
+            session = requests.Session()
+            retry_strategy = Retry(
+                total=3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                backoff_factor=1,
+            )
+            adapter = HTTPAdapter(max_retries=retry_strategy)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
         with session.request(
             url=url,
             auth=auth,